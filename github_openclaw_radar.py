@@ -2,204 +2,491 @@
 # GitHub OpenClaw Radar - v0.1
 # 掃描 GitHub 上與 OpenClaw 相關的最新動態，輸出 JSON + 簡易文字報告。
 
+import functools
+import hashlib
+import io
 import json
+import os
+import re
 import subprocess
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+# orjson 是 C extension，encode/decode 比 stdlib json 快好幾倍；沒裝就 fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+
+    def _load_stream(fp):
+        return orjson.loads(fp.read())
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+else:
+
+    def _load_stream(fp):
+        return json.load(fp)
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
 OUTPUT_PATH = Path("github_openclaw_radar.json")
+# gh 回應的磁碟快取：radar 與 Notion writer 是兩個 process，
+# in-process 的 lru_cache 跨不過去，落地成檔案才能讓 pipeline 共用同一次 fetch
+CACHE_DIR = Path(".gh_cache")
+CACHE_TTL_SECONDS = 300
 
 GH_BIN = "/home/linuxbrew/.linuxbrew/bin/gh"  # 依你目前環境安裝位置
 
+# gh 只需要這幾個變數；不用把整個 parent env 複製進每次 execve
+_MIN_ENV = {
+    k: os.environ[k]
+    for k in ("PATH", "HOME", "GH_TOKEN", "GITHUB_TOKEN")
+    if k in os.environ
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _gh_token() -> str:
+    """每個 process 最多問一次 gh auth token，拿不到就回空字串。"""
+    token = _MIN_ENV.get("GH_TOKEN") or _MIN_ENV.get("GITHUB_TOKEN")
+    if token:
+        return token
+    try:
+        return subprocess.check_output(
+            [GH_BIN, "auth", "token"], text=True, stdin=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _cache_path(args) -> Path:
+    digest = hashlib.sha256("\x00".join(args).encode("utf-8")).hexdigest()[:16]
+    return CACHE_DIR / f"{digest}.json"
+
 
 def run_gh(args):
-    """呼叫 gh CLI 並回傳 JSON 結果（list 或 dict）。"""
+    """呼叫 gh CLI 並回傳 JSON 結果（list 或 dict）。
+
+    同一組 args 在 TTL 內直接回磁碟快取，不再 spawn gh；
+    GraphQL POST 沒有 ETag/304 可用，就用 mtime 當新鮮度判斷。
+    直接對 child 的 stdout pipe 做 json.load：邊收邊解，不先在記憶體裡
+    堆一份完整的輸出字串再二次掃描，payload 大時省一半峰值記憶體。
+    """
+    cache = _cache_path(args)
+    try:
+        if time.time() - cache.stat().st_mtime < CACHE_TTL_SECONDS:
+            with cache.open("rb") as fp:
+                return _load_stream(fp)
+    except OSError:
+        pass  # 沒快取或讀不到就照常打 gh
+
     cmd = [GH_BIN] + args
-    out = subprocess.check_output(cmd, text=True)
-    return json.loads(out)
+    # 有 GH_TOKEN 時 gh 走快速認證路徑，不用每次 parse hosts.yml；
+    # 順便關掉 update check / prompt / color，排程環境都用不到
+    env = {
+        **_MIN_ENV,
+        "GH_NO_UPDATE_NOTIFIER": "1",
+        "GH_PROMPT_DISABLED": "1",
+        "NO_COLOR": "1",
+    }
+    token = _gh_token()
+    if token:
+        env["GH_TOKEN"] = token
+    # stdin 接 DEVNULL：排程環境下不會誤繼承 terminal / 觸發互動 prompt
+    p = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stdin=subprocess.DEVNULL, env=env
+    )
+    try:
+        data = _load_stream(p.stdout)
+    except ValueError:
+        # gh 失敗（auth 錯、斷網、query 打錯）時 stdout 通常是空的，
+        # decode 會比 exit code 先炸；先等 child 收尾，非零就報哪個指令失敗，
+        # 不要讓 caller 只看到一個 JSON parse error
+        p.stdout.close()
+        rc = p.wait()
+        if rc:
+            raise subprocess.CalledProcessError(rc, cmd) from None
+        raise
+    p.stdout.close()
+    rc = p.wait()
+    if rc:
+        raise subprocess.CalledProcessError(rc, cmd)
+
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        # 快取 key 含 bucket 對齊後的 cutoff，每個新時間桶就是一個新檔案；
+        # 寫新檔時順手清掉過期的舊檔，cron 環境下目錄才不會無限長大
+        now = time.time()
+        for stale in CACHE_DIR.glob("*.json"):
+            try:
+                if now - stale.stat().st_mtime >= CACHE_TTL_SECONDS:
+                    stale.unlink()
+            except OSError:
+                pass  # 被另一個 process 搶先刪掉也沒關係
+        cache.write_bytes(_dumps(data))
+    except OSError:
+        pass  # 快取寫不進去不影響本次結果
+    return data
 
 
-def iso_to_dt(s: str) -> datetime:
-    return datetime.fromisoformat(s.replace("Z", "+00:00"))
+# 三類項目的時間戳欄位優先序；issues/repos 沒有 mergedAt，取 get 落空即可
+_TS_KEYS = ("updatedAt", "createdAt", "mergedAt")
 
 
-def is_recent(ts: str, hours: int = 24) -> bool:
-    try:
-        dt = iso_to_dt(ts)
-    except Exception:
-        return False
-    now = datetime.now(timezone.utc)
-    return now - dt <= timedelta(hours=hours)
-
-
-def fetch_core_issues(hours: int = 24):
-    issues = run_gh([
-        "issue",
-        "list",
-        "--repo",
-        "openclaw/openclaw",
-        "--state",
-        "all",
-        "--limit",
-        "50",
-        "--json",
-        "number,title,state,createdAt,updatedAt,author,url",
-    ])
-    recent = []
-    for it in issues:
-        updated = it.get("updatedAt") or it.get("createdAt")
-        if updated and is_recent(updated, hours=hours):
-            recent.append(it)
-    return recent
-
-
-def fetch_core_prs(hours: int = 24):
-    prs = run_gh([
-        "pr",
-        "list",
-        "--repo",
-        "openclaw/openclaw",
-        "--state",
-        "all",
-        "--limit",
-        "50",
-        "--json",
-        "number,title,state,createdAt,updatedAt,author,url,mergedAt",
-    ])
-    recent = []
-    for it in prs:
-        updated = it.get("updatedAt") or it.get("createdAt") or it.get("mergedAt")
-        if updated and is_recent(updated, hours=hours):
-            recent.append(it)
-    return recent
-
-
-def fetch_openclaw_repos(hours: int = 24):
-    # 搜尋名字或描述中含 openclaw 的 repo
-    repos = run_gh([
-        "search",
-        "repos",
-        "openclaw",
-        "--sort",
-        "updated",
-        "--order",
-        "desc",
-        "--limit",
-        "30",
-        "--json",
-        "name,fullName,description,updatedAt,createdAt,url,owner",
+def _item_ts(it):
+    for k in _TS_KEYS:
+        ts = it.get(k)
+        if ts:
+            return ts
+    return None
+
+
+def filter_recent(items, hours, key_fn=_item_ts):
+    """留下時間戳在窗內的項目。
+
+    GitHub 回的時間戳都是 zero-padded 的 UTC ISO-8601，字典序即時間序，
+    所以整批只算一次 cutoff，逐項直接比字串，不用每項 parse datetime。
+    """
+    cutoff_iso = window_cutoff(hours)
+    return [
+        it
+        for it in items
+        if (ts := key_fn(it)) and ts.replace("+00:00", "Z") >= cutoff_iso
+    ]
+
+
+# 一條 GraphQL query 抓齊 issues + PRs + repo 搜尋，只付一次 subprocess/TLS/auth 成本。
+# 時間窗直接下放到伺服器端（issues 的 filterBy.since、repo 搜尋的 pushed:>），
+# 回傳的 payload 就只剩窗內的項目；PRs 沒有對應的 filter，仍靠客戶端過濾。
+RADAR_QUERY = """
+query($since: DateTime!, $repoQuery: String!) {
+  repo: repository(owner: "openclaw", name: "openclaw") {
+    issues(first: 50, filterBy: {since: $since}, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      nodes { number title state createdAt updatedAt url author { login } }
+    }
+    pullRequests(first: 50, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      nodes { number title state createdAt updatedAt mergedAt url author { login } }
+    }
+  }
+  search(query: $repoQuery, type: REPOSITORY, first: 30) {
+    nodes {
+      ... on Repository {
+        name nameWithOwner description createdAt updatedAt url owner { login }
+      }
+    }
+  }
+}
+"""
+
+
+def window_cutoff(hours: int) -> str:
+    """時間窗起點（ISO-8601 / UTC），給 GraphQL 的 since 與搜尋 query 用。
+
+    now 先對齊到 CACHE_TTL_SECONDS 邊界：radar 與 Notion writer 前後差個
+    幾秒跑，也會組出一模一樣的 query，gh 快取 key 才對得上。
+    """
+    now_ts = int(time.time()) // CACHE_TTL_SECONDS * CACHE_TTL_SECONDS
+    cutoff = datetime.fromtimestamp(now_ts, tz=timezone.utc) - timedelta(hours=hours)
+    return cutoff.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def fetch_all(hours: int = 24):
+    """一次 gh api graphql 來回抓齊三類資料，回傳 (issues, prs, repos)。"""
+    cutoff = window_cutoff(hours)
+    data = run_gh([
+        "api",
+        "graphql",
+        "-f",
+        f"query={RADAR_QUERY}",
+        "-f",
+        f"since={cutoff}",
+        "-f",
+        f"repoQuery=openclaw pushed:>{cutoff}",
     ])
-    recent = []
-    for r in repos:
-        updated = r.get("updatedAt") or r.get("createdAt")
-        if updated and is_recent(updated, hours=hours):
-            recent.append(r)
-    return recent
+    repo = (data.get("data") or {}).get("repo") or {}
+    raw_issues = (repo.get("issues") or {}).get("nodes") or []
+    raw_prs = (repo.get("pullRequests") or {}).get("nodes") or []
+    raw_repos = ((data.get("data") or {}).get("search") or {}).get("nodes") or []
+
+    # GraphQL 的 nameWithOwner 對應 REST 時代的 fullName，補回去讓下游不用改
+    for r in raw_repos:
+        r.setdefault("fullName", r.get("nameWithOwner"))
+
+    issues = filter_recent(raw_issues, hours)
+    prs = filter_recent(raw_prs, hours)
+    repos = filter_recent(raw_repos, hours)
+    return issues, prs, repos
+
 
+def _normalize_items(items):
+    """把 issue / PR 壓成下游真正會用到的平面欄位，author 也先抽成字串。"""
+    return [
+        {
+            "num": it.get("number"),
+            "title": (it.get("title") or "").strip(),
+            "state": it.get("state") or "?",
+            "author": (it.get("author") or {}).get("login") or "?",
+            "url": it.get("url"),
+            "updatedAt": it.get("updatedAt"),
+        }
+        for it in items
+    ]
 
-def build_snapshot(hours: int = 24):
+
+def _normalize_repos(repos):
+    return [
+        {
+            "fullName": r.get("fullName") or r.get("name") or "",
+            "owner": (r.get("owner") or {}).get("login") or "?",
+            "desc": (r.get("description") or "").strip(),
+            "url": r.get("url"),
+            "updatedAt": r.get("updatedAt"),
+        }
+        for r in repos
+    ]
+
+
+def snapshot_bucket(ttl_seconds: int = CACHE_TTL_SECONDS) -> int:
+    """給 build_snapshot 當快取 key 用的粗粒度時間桶（預設 5 分鐘）。"""
+    return int(time.time() // ttl_seconds)
+
+
+@functools.lru_cache(maxsize=8)
+def build_snapshot(hours: int = 24, _bucket: int = None):
+    # radar 與 Notion writer 可能在同一個排程裡各跑一次；以 (hours, 時間桶)
+    # 記住結果，同一個 process 內重複呼叫就不會再打一次 gh
+    issues, prs, repos = fetch_all(hours=hours)
+    # 這裡先整形一次（author/owner 抽成字串、strip 標題、丟掉用不到的欄位），
+    # summarize 與 Notion writer 之後就都是單層 key 存取
     snapshot = {
         "generatedAt": datetime.now(timezone.utc).isoformat(),
         "windowHours": hours,
-        "coreIssues": fetch_core_issues(hours=hours),
-        "corePRs": fetch_core_prs(hours=hours),
-        "repos": fetch_openclaw_repos(hours=hours),
+        "coreIssues": _normalize_items(issues),
+        "corePRs": _normalize_items(prs),
+        "repos": _normalize_repos(repos),
     }
     return snapshot
 
 
+# 簡單 heuristic：先看 conventional commit prefix，再看關鍵字。
+# 每個類別一條 precompiled regex，依優先序掃；(?i) 省掉每次 .lower()，
+# 每條 pattern 對標題只掃一次，取代原本逐關鍵字的 startswith/in。
+_CLASSIFY_RULES = (
+    (re.compile(r"(?i)^fix|bug|error"), "bug"),
+    (re.compile(r"(?i)^feat|feature|add "), "feature"),
+    (re.compile(r"(?i)^docs|doc|readme"), "docs"),
+    (re.compile(r"(?i)refactor"), "refactor"),
+)
+
+
 def classify_pr(title: str) -> str:
-    t = title.lower()
-    # 簡單 heuristic：先看 conventional commit prefix，再看關鍵字
-    if t.startswith("fix") or "bug" in t or "error" in t:
-        return "bug"
-    if t.startswith("feat") or "feature" in t or "add " in t:
-        return "feature"
-    if t.startswith("docs") or "doc" in t or "readme" in t:
-        return "docs"
-    if "refactor" in t:
-        return "refactor"
+    for pattern, label in _CLASSIFY_RULES:
+        if pattern.search(title):
+            return label
     return "other"
 
 
-def summarize(snapshot: dict) -> str:
+# Markdown 表頭是固定字串，模組載入時建好，summarize 每次呼叫直接寫入
+_ISSUE_TABLE_HEADER = "| # | 狀態 | 提出人 | 標題 |\n|---|------|--------|------|\n"
+_PR_TABLE_HEADER = "| # | 類型 | 狀態 | 作者 | 標題 |\n|---|------|------|------|------|\n"
+_REPO_TABLE_HEADER = "| Repo | 作者 | 說明 |\n|------|------|------|\n"
+
+
+# --- Notion block helpers ---
+# summarize_blocks 一趟同時輸出 Markdown 與 Notion blocks，
+# block 的組裝工具放這裡（notion_write_github_radar 會 import 本模組，反向不行）
+
+
+def _cell(content: str, url: str = None) -> dict:
+    """Notion rich-text 的單一 text cell；有 url 就附上連結。"""
+    text = {"content": content}
+    if url is not None:
+        text["link"] = {"url": url}
+    return {"type": "text", "text": text}
+
+
+def _heading(level: int, text: str) -> dict:
+    key = f"heading_{level}"
+    return {"object": "block", "type": key, key: {"rich_text": [_cell(text)]}}
+
+
+def _bullet(text: str) -> dict:
+    return {
+        "object": "block",
+        "type": "bulleted_list_item",
+        "bulleted_list_item": {"rich_text": [_cell(text)]},
+    }
+
+
+def _table_block(rows, width: int) -> dict:
+    """rows 是 list of list-of-_cell；第一列當表頭。"""
+    return {
+        "object": "block",
+        "type": "table",
+        "table": {
+            "table_width": width,
+            "has_column_header": True,
+            "has_row_header": False,
+            "children": [
+                {
+                    "object": "block",
+                    "type": "table_row",
+                    "table_row": {"cells": [[cell] for cell in row]},
+                }
+                for row in rows
+            ],
+        },
+    }
+
+
+def _issue_row(it) -> list:
+    return [
+        _cell(str(it["num"])),
+        _cell(it["state"]),
+        _cell(it["author"]),
+        _cell(it["title"], it["url"]),
+    ]
+
+
+def _pr_row(pr_type: str, it) -> list:
+    return [
+        _cell(str(it["num"])),
+        _cell(pr_type),
+        _cell(it["state"]),
+        _cell(it["author"]),
+        _cell(it["title"], it["url"]),
+    ]
+
+
+def _repo_row(r, desc: str) -> list:
+    return [_cell(r["fullName"], r["url"]), _cell(r["owner"]), _cell(desc)]
+
+
+def _short_desc(desc: str) -> str:
+    if len(desc) > 80:
+        return desc[:77] + "..."
+    return desc
+
+
+# 文案固定的 heading 與表頭 cells 在模組載入時建好一份；下游只讀不改
+# （只會被序列化送出），跨次呼叫共用同一組 dict 即可，不用每次重建。
+# 只有 heading_2 大標題帶動態的 hours，留在 summarize_blocks 裡現做。
+_HEADING_SUMMARY = _heading(3, "摘要")
+_HEADING_ISSUES = _heading(3, "openclaw/openclaw Issues")
+_HEADING_PRS = _heading(3, "openclaw/openclaw Pull Requests")
+_HEADING_REPOS = _heading(3, "最近更新的 OpenClaw 相關 Repo")
+_ISSUE_HEADER_ROW = [_cell("#"), _cell("狀態"), _cell("提出人"), _cell("標題")]
+_PR_HEADER_ROW = [_cell("#"), _cell("類型"), _cell("狀態"), _cell("作者"), _cell("標題")]
+_REPO_HEADER_ROW = [_cell("Repo"), _cell("作者"), _cell("說明")]
+
+
+def summarize_blocks(snapshot: dict):
+    """一趟走完 snapshot，同時產出 (Markdown 報告, Notion children blocks)。
+
+    版面決策只寫這一份，文字報告與 Notion 頁面不會再各自走鐘。
+    rows / children 都用 comprehension 或 extend 一次建好，
+    不走逐項 .append 的 bytecode 迴圈。
+    """
     hours = snapshot.get("windowHours", 24)
-    issues = snapshot.get("coreIssues", [])
-    prs = snapshot.get("corePRs", [])
-    repos = snapshot.get("repos", [])
+    issues = snapshot.get("coreIssues", [])[:10]
+    prs = snapshot.get("corePRs", [])[:10]
+    repos = snapshot.get("repos", [])[:10]
+
+    # 單一 StringIO buffer 逐行 write，不經過 list append + 最後 join 的雙份配置
+    buf = io.StringIO()
+    w = buf.write
+    children = [_heading(2, f"GitHub OpenClaw Radar（最近 {hours} 小時）")]
 
-    lines = []
     # 大標題
-    lines.append(f"## GitHub OpenClaw Radar（最近 {hours} 小時）\n")
+    w(f"## GitHub OpenClaw Radar（最近 {hours} 小時）\n\n")
 
     # 摘要段
-    issue_count = len(issues)
-    pr_count = len(prs)
-    repo_count = len(repos)
-    lines.append("### 摘要")
-    lines.append(f"- Issues 更新數量：約 {issue_count} 則")
-    lines.append(f"- PR 更新數量：約 {pr_count} 則（已依 bug/feature/docs/other 分類）")
-    lines.append(f"- 最近更新的 OpenClaw 相關 repo：約 {repo_count} 個")
-    lines.append("")
+    w("### 摘要\n")
+    summary_lines = (
+        f"Issues 更新數量：約 {len(snapshot.get('coreIssues', []))} 則",
+        f"PR 更新數量：約 {len(snapshot.get('corePRs', []))} 則（已依 bug/feature/docs/other 分類）",
+        f"最近更新的 OpenClaw 相關 repo：約 {len(snapshot.get('repos', []))} 個",
+    )
+    buf.writelines(f"- {s}\n" for s in summary_lines)
+    children.extend((_HEADING_SUMMARY, *map(_bullet, summary_lines)))
+    w("\n")
 
     # Issues table
-    lines.append("### [openclaw/openclaw] Issues（最近 {hours} 小時）")
+    w(f"### [openclaw/openclaw] Issues（最近 {hours} 小時）\n")
     if not issues:
-        lines.append("- 最近沒有新的或更新的 issue\n")
+        w("- 最近沒有新的或更新的 issue\n\n")
     else:
-        lines.append("| # | 狀態 | 提出人 | 標題 |")
-        lines.append("|---|------|--------|------|")
-        for it in issues[:10]:
-            num = it.get("number")
-            title = (it.get("title") or "").strip().replace("|", "‖")
-            state = it.get("state") or "?"
-            author = (it.get("author") or {}).get("login") if isinstance(it.get("author"), dict) else None
-            author = author or "?"
-            url = it.get("url")
-            lines.append(f"| {num} | {state} | {author} | [{title}]({url}) |")
-        lines.append("")
+        w(_ISSUE_TABLE_HEADER)
+        buf.writelines(
+            f"| {it['num']} | {it['state']} | {it['author']} "
+            f"| [{it['title'].replace('|', '‖')}]({it['url']}) |\n"
+            for it in issues
+        )
+        w("\n")
+    issue_rows = [_ISSUE_HEADER_ROW, *map(_issue_row, issues)]
+    children.extend((_HEADING_ISSUES, _table_block(issue_rows, width=4)))
 
     # PRs table with type classification
-    lines.append("### [openclaw/openclaw] Pull Requests（分類：bug/feature/docs/other）")
-    if not prs:
-        lines.append("- 最近沒有新的或更新的 PR\n")
+    w("### [openclaw/openclaw] Pull Requests（分類：bug/feature/docs/other）\n")
+    # 分類一次算好，Markdown 行與 Notion row 共用
+    typed_prs = [(classify_pr(it["title"]), it) for it in prs]
+    if not typed_prs:
+        w("- 最近沒有新的或更新的 PR\n\n")
     else:
-        lines.append("| # | 類型 | 狀態 | 作者 | 標題 |")
-        lines.append("|---|------|------|------|------|")
-        for it in prs[:10]:
-            num = it.get("number")
-            title = (it.get("title") or "").strip().replace("|", "‖")
-            state = it.get("state") or "?"
-            author = (it.get("author") or {}).get("login") if isinstance(it.get("author"), dict) else None
-            author = author or "?"
-            url = it.get("url")
-            pr_type = classify_pr(title)
-            lines.append(f"| {num} | {pr_type} | {state} | {author} | [{title}]({url}) |")
-        lines.append("")
+        w(_PR_TABLE_HEADER)
+        buf.writelines(
+            f"| {it['num']} | {pr_type} | {it['state']} | {it['author']} "
+            f"| [{it['title'].replace('|', '‖')}]({it['url']}) |\n"
+            for pr_type, it in typed_prs
+        )
+        w("\n")
+    pr_rows = [_PR_HEADER_ROW, *(_pr_row(pr_type, it) for pr_type, it in typed_prs)]
+    children.extend((_HEADING_PRS, _table_block(pr_rows, width=5)))
 
     # Repos table
-    lines.append("### [GitHub] 最近更新的 OpenClaw 相關 repo")
-    if not repos:
-        lines.append("- 最近沒有新的或更新的相關 repo")
+    w("### [GitHub] 最近更新的 OpenClaw 相關 repo\n")
+    # 截短後的說明同樣是兩邊共用
+    shown_repos = [(r, _short_desc(r["desc"])) for r in repos]
+    if not shown_repos:
+        w("- 最近沒有新的或更新的相關 repo\n")
     else:
-        lines.append("| Repo | 作者 | 說明 |")
-        lines.append("|------|------|------|")
-        for r in repos[:10]:
-            full = (r.get("fullName") or r.get("name") or "").replace("|", "‖")
-            desc = (r.get("description") or "").strip().replace("|", "‖")
-            url = r.get("url")
-            owner = (r.get("owner") or {}).get("login") if isinstance(r.get("owner"), dict) else None
-            owner = owner or "?"
-            if len(desc) > 80:
-                desc = desc[:77] + "..."
-            lines.append(f"| [{full}]({url}) | {owner} | {desc} |")
+        w(_REPO_TABLE_HEADER)
+        buf.writelines(
+            f"| [{r['fullName'].replace('|', '‖')}]({r['url']}) "
+            f"| {r['owner']} | {desc.replace('|', '‖')} |\n"
+            for r, desc in shown_repos
+        )
+    repo_rows = [_REPO_HEADER_ROW, *(_repo_row(r, desc) for r, desc in shown_repos)]
+    children.extend((_HEADING_REPOS, _table_block(repo_rows, width=3)))
+
+    return buf.getvalue(), children
 
-    return "\n".join(lines)
+
+def snapshot_is_empty(snapshot: dict) -> bool:
+    return not (
+        snapshot.get("coreIssues") or snapshot.get("corePRs") or snapshot.get("repos")
+    )
+
+
+def summarize(snapshot: dict) -> str:
+    # 離峰常常三個列表全空，直接回一行，省掉整個報告骨架的組裝
+    if snapshot_is_empty(snapshot):
+        hours = snapshot.get("windowHours", 24)
+        return f"## GitHub OpenClaw Radar（最近 {hours} 小時）\n\n- 最近沒有任何更新\n"
+    report, _children = summarize_blocks(snapshot)
+    return report
 
 
 def main():
-    snapshot = build_snapshot(hours=24)
-    OUTPUT_PATH.write_text(json.dumps(snapshot, ensure_ascii=False, indent=2), encoding="utf-8")
+    snapshot = build_snapshot(hours=24, _bucket=snapshot_bucket())
+    OUTPUT_PATH.write_bytes(_dumps(snapshot))
     report = summarize(snapshot)
     print(report)
 